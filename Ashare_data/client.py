@@ -6,17 +6,59 @@ import asyncio
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import Any, Dict, Mapping, Optional
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 import httpx
 
+try:  # pragma: no cover - depends on the optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - depends on the optional dependency
+    orjson = None
+
 __all__ = ["AshareClient", "AshareClientError"]
 
+_POOL_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=90)
+_RETRYABLE_ERRORS = (httpx.HTTPError, ValueError)
+
+
+def _fast_json(response: httpx.Response) -> Any:
+    """Decode ``response`` with :mod:`orjson` when available."""
+
+    if orjson is None:
+        return response.json()
+    return orjson.loads(response.content)
+
 
 class AshareClientError(RuntimeError):
     """Base exception for errors raised by :class:`AshareClient`."""
 
 
+class _TokenBucket:
+    """Token bucket bookkeeping shared by the sync and async rate limiters.
+
+    :meth:`reserve` never blocks: it takes a token (possibly going into debt)
+    and returns how long the caller has to wait before using it, so callers
+    never sleep while holding a lock.
+    """
+
+    __slots__ = ("_rate", "_capacity", "_tokens", "_last_refill")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+
+    def reserve(self) -> float:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+        self._tokens -= 1.0
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self._rate
+
+
 @dataclass
 class AshareClient:
     """A small helper around :mod:`httpx` for the Ashare data API.
@@ -41,12 +83,24 @@ class AshareClient:
         ``backoff_factor * (2 ** n)`` seconds.
     rate_limit_per_second:
         Optional rate limit expressed as the maximum number of requests per
-        second.  When provided, the client enforces a minimum delay between
-        calls to the remote API.
+        second.  When provided, requests are admitted through a token bucket
+        refilled at this rate.
     transport:
         Optional :class:`httpx.BaseTransport` instance.  This is primarily
         intended for testing where a :class:`httpx.MockTransport` can be
         supplied.
+    rate_limit_burst:
+        Capacity of the token bucket, i.e. how many requests may be issued
+        back to back before the rate limit kicks in.  Defaults to
+        ``rate_limit_per_second`` (but at least one request).
+
+    Connection pools are created on first use and reused until :meth:`close`
+    / :meth:`aclose`.  The asynchronous pool belongs to one event loop at a
+    time: when the client is used from another loop a new pool is opened and
+    the previous one is closed on its own loop if that loop is still running
+    (unless a ``transport`` was supplied, which both pools share).
+    Connections of a loop that has already been closed cannot be shut down
+    cleanly and are left to the garbage collector.
     """
 
     base_url: str
@@ -57,10 +111,14 @@ class AshareClient:
     backoff_factor: float = 0.5
     rate_limit_per_second: Optional[float] = None
     transport: Optional[httpx.BaseTransport] = None
-    _last_request_time_sync: float = field(default=0.0, init=False, repr=False)
-    _last_request_time_async: float = field(default=0.0, init=False, repr=False)
+    rate_limit_burst: Optional[float] = None
+    _retry_delays: Tuple[float, ...] = field(default=(), init=False, repr=False)
+    _sync_bucket: _TokenBucket | None = field(default=None, init=False, repr=False)
+    _async_bucket: _TokenBucket | None = field(default=None, init=False, repr=False)
     _sync_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
-    _async_lock: asyncio.Lock | None = field(default=None, init=False, repr=False)
+    _sync_client: httpx.Client | None = field(default=None, init=False, repr=False)
+    _async_client: httpx.AsyncClient | None = field(default=None, init=False, repr=False)
+    _async_client_loop: asyncio.AbstractEventLoop | None = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         self.base_url = self.base_url.rstrip("/")
@@ -70,8 +128,58 @@ class AshareClient:
             self.headers = dict(self.headers)
         if self.max_retries < 0:
             raise ValueError("max_retries must be >= 0")
+        # Backoff before each retry; the final attempt is made outside the loop.
+        self._retry_delays = tuple(self.backoff_factor * (2**attempt) for attempt in range(self.max_retries))
         if self.rate_limit_per_second is not None and self.rate_limit_per_second <= 0:
             raise ValueError("rate_limit_per_second must be positive when provided")
+        if self.rate_limit_burst is not None and self.rate_limit_burst < 1:
+            raise ValueError("rate_limit_burst must be >= 1 when provided")
+        if self.rate_limit_per_second:
+            capacity = self.rate_limit_burst or max(1.0, self.rate_limit_per_second)
+            self._sync_bucket = _TokenBucket(self.rate_limit_per_second, capacity)
+            self._async_bucket = _TokenBucket(self.rate_limit_per_second, capacity)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Release the pooled synchronous connections."""
+
+        with self._sync_lock:
+            sync_client, self._sync_client = self._sync_client, None
+        if sync_client is not None:
+            sync_client.close()
+
+    async def aclose(self) -> None:
+        """Release both the asynchronous and synchronous connection pools."""
+
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_client_loop = None
+        self.close()
+
+    def __enter__(self) -> "AshareClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "AshareClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def __del__(self) -> None:
+        # Safety net for callers that never close the client explicitly.  The
+        # async pool cannot be awaited here and is left to the event loop.
+        sync_client = getattr(self, "_sync_client", None)
+        if sync_client is not None:
+            try:
+                sync_client.close()
+            except Exception:  # pragma: no cover - interpreter shutdown
+                pass
 
     # ------------------------------------------------------------------
     # Public synchronous API
@@ -140,12 +248,6 @@ class AshareClient:
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
-    @property
-    def _min_interval(self) -> float:
-        if not self.rate_limit_per_second:
-            return 0.0
-        return 1.0 / self.rate_limit_per_second
-
     def _merge_params(self, params: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
         merged: Dict[str, Any] = {}
         if self.default_params:
@@ -161,75 +263,109 @@ class AshareClient:
             endpoint = "/" + endpoint
         return f"{self.base_url}{endpoint}"
 
+    def _get_sync_client(self) -> httpx.Client:
+        sync_client = self._sync_client
+        if sync_client is None:
+            # Created under the lock so concurrent threads share one pool
+            # instead of each building (and leaking) their own.
+            with self._sync_lock:
+                sync_client = self._sync_client
+                if sync_client is None:
+                    sync_client = self._sync_client = httpx.Client(
+                        headers=self.headers, timeout=self.timeout, transport=self.transport, limits=_POOL_LIMITS
+                    )
+        return sync_client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        # ``httpx.AsyncClient`` connections are bound to the loop they were
+        # opened on, so a fresh pool is created when the client is reused from
+        # a different event loop (e.g. successive ``asyncio.run`` calls).
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            previous, previous_loop = self._async_client, self._async_client_loop
+            self._async_client = httpx.AsyncClient(
+                headers=self.headers, timeout=self.timeout, transport=self.transport, limits=_POOL_LIMITS
+            )
+            self._async_client_loop = loop
+            # Its connections can only be closed on the loop that opened them.
+            # A caller supplied ``transport`` is shared with the new pool and
+            # must stay open.
+            if (
+                previous is not None
+                and self.transport is None
+                and previous_loop is not None
+                and previous_loop.is_running()
+            ):
+                asyncio.run_coroutine_threadsafe(previous.aclose(), previous_loop)
+        return self._async_client
+
     def _apply_rate_limit_sync(self) -> None:
-        min_interval = self._min_interval
-        if not min_interval:
+        bucket = self._sync_bucket
+        if bucket is None:
             return
 
         with self._sync_lock:
-            now = time.monotonic()
-            wait_for = min_interval - (now - self._last_request_time_sync)
-            if wait_for > 0:
-                time.sleep(wait_for)
-                now = time.monotonic()
-            self._last_request_time_sync = now
+            wait_for = bucket.reserve()
+        if wait_for > 0:
+            time.sleep(wait_for)
 
     async def _apply_rate_limit_async(self) -> None:
-        min_interval = self._min_interval
-        if not min_interval:
+        bucket = self._async_bucket
+        if bucket is None:
             return
 
-        if self._async_lock is None:
-            self._async_lock = asyncio.Lock()
-        async with self._async_lock:
-            now = time.monotonic()
-            wait_for = min_interval - (now - self._last_request_time_async)
-            if wait_for > 0:
-                await asyncio.sleep(wait_for)
-                now = time.monotonic()
-            self._last_request_time_async = now
+        # ``reserve`` never awaits, so it runs atomically on the event loop and
+        # needs no ``asyncio.Lock`` (which would also tie the client to a loop).
+        wait_for = bucket.reserve()
+        if wait_for > 0:
+            await asyncio.sleep(wait_for)
 
     def _request_sync(self, method: str, endpoint: str, params: Optional[Mapping[str, Any]]) -> Any:
         params_dict = self._merge_params(params)
         url = self._build_url(endpoint)
-        last_error: Exception | None = None
-        for attempt in range(self.max_retries + 1):
-            if self._min_interval:
-                self._apply_rate_limit_sync()
+        request = self._get_sync_client().request
+        rate_limit = self._apply_rate_limit_sync if self._sync_bucket is not None else None
+        sleep = time.sleep
+        for delay in self._retry_delays:
+            if rate_limit is not None:
+                rate_limit()
             try:
-                with httpx.Client(timeout=self.timeout, headers=self.headers, transport=self.transport) as client:
-                    response = client.request(method, url, params=params_dict)
+                response = request(method, url, params=params_dict)
                 response.raise_for_status()
-                return response.json()
-            except (httpx.HTTPError, ValueError) as exc:
-                last_error = exc
-                if attempt == self.max_retries:
-                    raise AshareClientError(f"{method} {url} failed after retries") from exc
-                delay = self.backoff_factor * (2**attempt)
+                return _fast_json(response)
+            except _RETRYABLE_ERRORS:
                 if delay > 0:
-                    time.sleep(delay)
-        raise AshareClientError("Request failed") from last_error
+                    sleep(delay)
+        if rate_limit is not None:
+            rate_limit()
+        try:
+            response = request(method, url, params=params_dict)
+            response.raise_for_status()
+            return _fast_json(response)
+        except _RETRYABLE_ERRORS as exc:
+            raise AshareClientError(f"{method} {url} failed after retries") from exc
 
     async def _request_async(self, method: str, endpoint: str, params: Optional[Mapping[str, Any]]) -> Any:
         params_dict = self._merge_params(params)
         url = self._build_url(endpoint)
-        last_error: Exception | None = None
-        for attempt in range(self.max_retries + 1):
-            if self._min_interval:
-                await self._apply_rate_limit_async()
+        request = self._get_async_client().request
+        rate_limit = self._apply_rate_limit_async if self._async_bucket is not None else None
+        sleep = asyncio.sleep
+        for delay in self._retry_delays:
+            if rate_limit is not None:
+                await rate_limit()
             try:
-                async with httpx.AsyncClient(
-                    timeout=self.timeout, headers=self.headers, transport=self.transport
-                ) as client:
-                    response = await client.request(method, url, params=params_dict)
+                response = await request(method, url, params=params_dict)
                 response.raise_for_status()
-                return response.json()
-            except (httpx.HTTPError, ValueError) as exc:
-                last_error = exc
-                if attempt == self.max_retries:
-                    raise AshareClientError(f"{method} {url} failed after retries") from exc
-                delay = self.backoff_factor * (2**attempt)
+                return _fast_json(response)
+            except _RETRYABLE_ERRORS:
                 if delay > 0:
-                    await asyncio.sleep(delay)
-        raise AshareClientError("Request failed") from last_error
-
+                    await sleep(delay)
+        if rate_limit is not None:
+            await rate_limit()
+        try:
+            response = await request(method, url, params=params_dict)
+            response.raise_for_status()
+            return _fast_json(response)
+        except _RETRYABLE_ERRORS as exc:
+            raise AshareClientError(f"{method} {url} failed after retries") from exc
@@ -7,7 +7,8 @@ successful response for each symbol/date combination.
 from __future__ import annotations
 
 from datetime import date
-from typing import Iterable, List, Optional
+from operator import attrgetter
+from typing import Awaitable, Callable, Iterable, Optional, Tuple
 
 from Ashare_data.providers.base import BaseProvider, ProviderResult
 from Ashare_data.utils.logging import get_logger
@@ -17,33 +18,29 @@ class DailyFetcher:
     """Combine multiple provider instances into a single fetch API."""
 
     def __init__(self, providers: Iterable[BaseProvider]):
-        self._providers: List[BaseProvider] = sorted(providers, key=lambda provider: provider.priority, reverse=True)
+        self._providers: Tuple[BaseProvider, ...] = tuple(sorted(providers, key=attrgetter("priority"), reverse=True))
+        self._fetch_fns: Tuple[Tuple[str, Callable[[str, date], Awaitable[Optional[ProviderResult]]]], ...] = tuple(
+            (provider.name, provider.fetch_daily) for provider in self._providers
+        )
         self._logger = get_logger("Ashare.fetcher.daily")
 
     async def fetch(self, symbol: str, trade_date: date) -> Optional[ProviderResult]:
-        """Return the first successful :class:`ProviderResult` or ``None``."""
+        """Return the first successful :class:`ProviderResult` or ``None``.
 
-        for provider in self._providers:
+        Providers emit normalised results (see :meth:`ProviderResult.normalized`),
+        so they are returned as-is.
+        """
+
+        for name, fetch_daily in self._fetch_fns:
             try:
-                result = await provider.fetch_daily(symbol, trade_date)
+                result = await fetch_daily(symbol, trade_date)
             except Exception as exc:  # pragma: no cover - network errors
-                self._logger.warning("Provider %s failed for %s on %s: %s", provider.name, symbol, trade_date, exc)
+                self._logger.warning("Provider %s failed for %s on %s: %s", name, symbol, trade_date, exc)
                 continue
-            if result:
-                return self._clean(result)
+            if result is not None:
+                return result
         return None
 
-    def _clean(self, result: ProviderResult) -> ProviderResult:
-        """Coerce numeric fields and fill basic defaults."""
-
-        result.open = float(result.open or result.close)
-        result.high = float(max(result.high, result.open, result.close))
-        result.low = float(min(result.low, result.open, result.close))
-        result.close = float(result.close)
-        result.volume = float(result.volume or 0)
-        result.turnover = float(result.turnover or 0)
-        return result
-
     async def close(self) -> None:
         for provider in self._providers:
             await provider.close()
@@ -9,14 +9,52 @@ rest of the project can rely on a compact interface.
 
 from __future__ import annotations
 
+import importlib.util
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import date
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+import httpx
 
 from Ashare_data.utils.config import get_settings
 from Ashare_data.utils.logging import get_logger
 from Ashare_data.utils.rate_limiter import AsyncRateLimiter, async_retry
+from Ashare_data.utils.serialization import response_json
+
+
+_POOL_LIMITS = httpx.Limits(max_keepalive_connections=16, max_connections=32, keepalive_expiry=90)
+
+# HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``).
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def create_http_client(timeout: float) -> httpx.AsyncClient:
+    """Return a pooled :class:`httpx.AsyncClient` shared by a provider's requests.
+
+    HTTP/2 is enabled when ``h2`` is installed so concurrent fetches are
+    multiplexed over a single connection.
+    """
+
+    return httpx.AsyncClient(timeout=timeout, limits=_POOL_LIMITS, http2=_HTTP2_AVAILABLE)
+
+
+# Maximum number of responses kept for conditional GET revalidation.
+_VALIDATOR_CACHE_SIZE = 256
+
+
+# Client errors that are worth backing off for.
+_RETRYABLE_CLIENT_ERRORS = frozenset({httpx.codes.REQUEST_TIMEOUT, httpx.codes.TOO_MANY_REQUESTS})
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Client errors (4xx) other than 408/429 will not succeed on retry; everything else may."""
+
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return not 400 <= status < 500 or status in _RETRYABLE_CLIENT_ERRORS
+    return True
 
 
 @dataclass(slots=True)
@@ -33,6 +71,39 @@ class ProviderResult:
     turnover: float
     raw: Dict[str, Any]
 
+    @classmethod
+    def normalized(
+        cls,
+        *,
+        symbol: str,
+        trade_date: date,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        turnover: float,
+        raw: Dict[str, Any],
+    ) -> "ProviderResult":
+        """Build a result with basic defaults filled and a consistent range.
+
+        A missing open falls back to the close, ``high``/``low`` are widened to
+        cover open and close, and empty volume/turnover become ``0.0``.
+        Providers use this at parse time so fetchers can trust the values.
+        """
+
+        if not open:
+            open = close
+        if high < open:
+            high = open
+        if high < close:
+            high = close
+        if low > open:
+            low = open
+        if low > close:
+            low = close
+        return cls(symbol, trade_date, open, high, low, close, volume or 0.0, turnover or 0.0, raw)
+
 
 class BaseProvider(ABC):
     """Common interface for all data providers."""
@@ -46,6 +117,8 @@ class BaseProvider(ABC):
         self._rate_limiter = rate_limiter
         self._retry_attempts = settings.retry_attempts
         self._retry_base_delay = settings.retry_base_delay
+        # (url, params) -> (ETag, Last-Modified, decoded payload)
+        self._validators: OrderedDict[Tuple[str, Tuple[Tuple[str, Any], ...]], Tuple[Optional[str], Optional[str], Any]] = OrderedDict()
 
     @property
     def logger(self):
@@ -60,8 +133,59 @@ class BaseProvider(ABC):
             return
         await self._rate_limiter.acquire()
 
+    async def _get_json(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        timeout: float,
+        prepare: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """GET ``url`` and decode the JSON body, revalidating cached responses.
+
+        Responses carrying an ``ETag`` or ``Last-Modified`` header are kept in a
+        small LRU cache.  Repeating the same request sends the matching
+        ``If-None-Match`` / ``If-Modified-Since`` headers and, on a
+        ``304 Not Modified`` answer, returns the cached payload without
+        downloading or decoding it again.
+
+        ``prepare`` converts a freshly decoded payload; its result is what is
+        cached and returned, so structures derived from a response are built
+        once however often it is revalidated.
+        """
+
+        key = (url, tuple(sorted(params.items())) if params else ())
+        cached = self._validators.get(key)
+        headers: Dict[str, str] = {}
+        if cached is not None:
+            etag, last_modified, _payload = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        response = await client.get(url, params=params, headers=headers, timeout=timeout)
+        if response.status_code == httpx.codes.NOT_MODIFIED and cached is not None:
+            self._validators.move_to_end(key)
+            return cached[2]
+        response.raise_for_status()
+        payload = response_json(response)
+        if prepare is not None:
+            payload = prepare(payload)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._validators[key] = (etag, last_modified, payload)
+            self._validators.move_to_end(key)
+            if len(self._validators) > _VALIDATOR_CACHE_SIZE:
+                self._validators.popitem(last=False)
+        else:
+            self._validators.pop(key, None)
+        return payload
+
     def _with_retry(self, func):
-        return async_retry(attempts=self._retry_attempts, base_delay=self._retry_base_delay)(func)
+        return async_retry(
+            attempts=self._retry_attempts, base_delay=self._retry_base_delay, retry_on=_is_retryable
+        )(func)
 
     @abstractmethod
     async def fetch_daily(self, symbol: str, trade_date: date) -> Optional[ProviderResult]:
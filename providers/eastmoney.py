@@ -4,13 +4,65 @@ from __future__ import annotations
 
 from datetime import date
 from typing import Any, Dict, Optional
+from urllib.parse import quote, urlencode
 
 import httpx
 
-from Ashare_data.providers.base import BaseProvider, ProviderResult
+from Ashare_data.providers.base import BaseProvider, ProviderResult, create_http_client
 from Ashare_data.utils.config import get_settings
 from Ashare_data.utils.rate_limiter import AsyncRateLimiter
 
+# Query parameters shared by every kline request, encoded once at import time.
+_STATIC_QS = urlencode(
+    {
+        "fields1": "f1,f2,f3,f4,f5,f6",
+        "fields2": "f51,f52,f53,f54,f55,f56,f57",
+        "klt": 101,
+        "fqt": 1,
+    }
+)
+
+
+class _Klines:
+    """Kline rows of one EastMoney payload with by-date lookup.
+
+    The first lookup scans the rows and stops at the match, which is all a
+    one-off :meth:`EastMoneyProvider.fetch_daily` needs.  Payloads kept by the
+    conditional GET cache are looked up again, so from the second lookup on a
+    ``{date: row}`` index is built once and used instead.
+    """
+
+    __slots__ = ("payload", "_rows", "_index", "_scanned")
+
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        self.payload = payload
+        data = payload.get("data") if isinstance(payload, dict) else None
+        # ``klines`` is a list of comma separated strings: date,open,close,high,low,volume,turnover
+        self._rows = (data.get("klines") or ()) if isinstance(data, dict) else ()
+        self._index: Optional[Dict[str, str]] = None
+        self._scanned = False
+
+    def get(self, day: str) -> Optional[str]:
+        """Return the row for ``day`` (``YYYY-MM-DD``) or ``None``."""
+
+        if self._index is None:
+            if not self._scanned:
+                self._scanned = True
+                prefix = day + ","
+                for row in self._rows:
+                    if isinstance(row, str) and row.startswith(prefix):
+                        return row
+                return None
+            self._index = self.by_date()
+        return self._index.get(day)
+
+    def by_date(self) -> Dict[str, str]:
+        """Map the leading ``YYYY-MM-DD`` of each row to the row itself."""
+
+        if self._index is None:
+            self._index = {row.split(",", 1)[0]: row for row in self._rows if isinstance(row, str)}
+        return self._index
+
 
 class EastMoneyProvider(BaseProvider):
     """Fetch daily quotes using the public EastMoney API."""
@@ -22,48 +74,31 @@ class EastMoneyProvider(BaseProvider):
         limiter = rate_limiter or AsyncRateLimiter(rate=settings.max_requests_per_second, per=1)
         super().__init__(priority=priority, rate_limiter=limiter)
         self._endpoint = settings.eastmoney_endpoint
+        separator = "&" if "?" in self._endpoint else "?"
+        self._url_prefix = f"{self._endpoint}{separator}{_STATIC_QS}&secid="
         self._timeout = settings.http_timeout
-        self._client = client
+        self._client = client or create_http_client(self._timeout)
         self._owns_client = client is None
+        # Wrapped once here rather than per fetch; ``async_retry`` fixes its
+        # sleep schedule at decoration time.
+        self._retrying_request_daily = self._with_retry(self._request_daily)
+        self._retrying_request_klines = self._with_retry(self._request_klines)
 
-    async def _request_daily(self, symbol: str, trade_date: date) -> Optional[Dict[str, Any]]:
-        params = {
-            "fields1": "f1,f2,f3,f4,f5,f6",
-            "fields2": "f51,f52,f53,f54,f55,f56,f57",
-            "klt": 101,
-            "fqt": 1,
-            "secid": symbol,
-        }
-        client = self._client or httpx.AsyncClient(timeout=self._timeout)
-        close_client = client is not self._client
-        try:
-            response = await client.get(self._endpoint, params=params, timeout=self._timeout)
-            response.raise_for_status()
-            payload = response.json()
-        finally:
-            if close_client:
-                await client.aclose()
-        return payload
-
-    def _parse_payload(self, symbol: str, trade_date: date, payload: Dict[str, Any]) -> Optional[ProviderResult]:
-        data = payload.get("data") or {}
-        klines = data.get("klines")
-        if not klines:
-            return None
-        # ``klines`` is a list of comma separated strings: date,open,close,high,low,volume,turnover
-        target = None
-        date_str = trade_date.strftime("%Y-%m-%d")
-        for row in klines:
-            if not isinstance(row, str):
-                continue
-            if row.startswith(date_str):
-                target = row
-                break
-        if target is None:
-            return None
+    async def _request_daily(self, symbol: str, trade_date: date) -> _Klines:
+        return await self._request_klines(symbol)
+
+    async def _request_klines(self, symbol: str, start: Optional[date] = None, end: Optional[date] = None) -> _Klines:
+        url = self._url_prefix + quote(symbol, safe=".")
+        if start is not None:
+            url += f"&beg={start.year:04d}{start.month:02d}{start.day:02d}"
+        if end is not None:
+            url += f"&end={end.year:04d}{end.month:02d}{end.day:02d}"
+        return await self._get_json(self._client, url, None, self._timeout, prepare=_Klines)
+
+    def _parse_row(self, symbol: str, trade_date: date, row: str, raw: Dict[str, Any]) -> Optional[ProviderResult]:
         try:
-            (_date, open_price, close_price, high_price, low_price, volume, turnover) = target.split(",")[:7]
-            return ProviderResult(
+            (_date, open_price, close_price, high_price, low_price, volume, turnover) = row.split(",")[:7]
+            return ProviderResult.normalized(
                 symbol=symbol,
                 trade_date=trade_date,
                 open=float(open_price),
@@ -72,20 +107,43 @@ class EastMoneyProvider(BaseProvider):
                 close=float(close_price),
                 volume=float(volume),
                 turnover=float(turnover),
-                raw=payload,
+                raw=raw,
             )
         except (ValueError, TypeError):
             self.logger.debug("EastMoney provider returned malformed kline for %s", symbol)
             return None
 
+    def _parse_payload(self, symbol: str, trade_date: date, klines: _Klines) -> Optional[ProviderResult]:
+        target = klines.get(trade_date.isoformat())
+        if target is None:
+            return None
+        return self._parse_row(symbol, trade_date, target, klines.payload)
+
     async def fetch_daily(self, symbol: str, trade_date: date) -> Optional[ProviderResult]:
         await self._apply_rate_limit()
-        request = self._with_retry(self._request_daily)
-        payload = await request(symbol, trade_date)
-        if not payload:
-            return None
-        return self._parse_payload(symbol, trade_date, payload)
+        klines = await self._retrying_request_daily(symbol, trade_date)
+        return self._parse_payload(symbol, trade_date, klines)
+
+    async def fetch_range(self, symbol: str, start: date, end: date) -> Dict[date, ProviderResult]:
+        """Return every bar between ``start`` and ``end`` using a single request."""
+
+        await self._apply_rate_limit()
+        klines = await self._retrying_request_klines(symbol, start, end)
+        results: Dict[date, ProviderResult] = {}
+        for date_str, row in klines.by_date().items():
+            try:
+                trade_date = date.fromisoformat(date_str)
+            except ValueError:
+                continue
+            if not start <= trade_date <= end:
+                continue
+            # Each bar keeps only its own row; the shared range payload would
+            # be stored once per bar otherwise.
+            result = self._parse_row(symbol, trade_date, row, {"kline": row})
+            if result is not None:
+                results[trade_date] = result
+        return results
 
     async def close(self) -> None:
-        if self._owns_client and self._client is not None:
+        if self._owns_client:
             await self._client.aclose()
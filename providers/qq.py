@@ -7,7 +7,7 @@ from typing import Any, Dict, Optional
 
 import httpx
 
-from Ashare_data.providers.base import BaseProvider, ProviderResult
+from Ashare_data.providers.base import BaseProvider, ProviderResult, create_http_client
 from Ashare_data.utils.config import get_settings
 from Ashare_data.utils.rate_limiter import AsyncRateLimiter
 
@@ -23,26 +23,20 @@ class QQProvider(BaseProvider):
         super().__init__(priority=priority, rate_limiter=limiter)
         self._endpoint = settings.qq_endpoint
         self._timeout = settings.http_timeout
-        self._client = client
+        self._client = client or create_http_client(self._timeout)
         self._owns_client = client is None
+        # Wrapped once here rather than per fetch; ``async_retry`` fixes its
+        # sleep schedule at decoration time.
+        self._retrying_request_daily = self._with_retry(self._request_daily)
 
     async def _request_daily(self, symbol: str, trade_date: date) -> Optional[Dict[str, Any]]:
         params = {
             "page": 1,
             "pageSize": 1,
-            "reqDay": trade_date.strftime("%Y-%m-%d"),
+            "reqDay": trade_date.isoformat(),
             "symbol": symbol,
         }
-        client = self._client or httpx.AsyncClient(timeout=self._timeout)
-        close_client = client is not self._client
-        try:
-            response = await client.get(self._endpoint, params=params, timeout=self._timeout)
-            response.raise_for_status()
-            payload = response.json()
-        finally:
-            if close_client:
-                await client.aclose()
-        return payload
+        return await self._get_json(self._client, self._endpoint, params, self._timeout)
 
     def _parse_payload(self, symbol: str, trade_date: date, payload: Dict[str, Any]) -> Optional[ProviderResult]:
         data = payload.get("data") or {}
@@ -55,17 +49,19 @@ class QQProvider(BaseProvider):
             bar = data["diff"][0]
         else:
             bar = data
+        # Conditional expressions instead of ``bar.get(key, bar.get(alt))`` so
+        # the alternate key is only looked up when the primary one is absent.
         try:
-            open_price = float(bar.get("open", bar.get("openPrice")))
-            high_price = float(bar.get("high", bar.get("highest")))
-            low_price = float(bar.get("low", bar.get("lowest")))
-            close_price = float(bar.get("close", bar.get("price")))
+            open_price = float(bar["open"] if "open" in bar else bar.get("openPrice"))
+            high_price = float(bar["high"] if "high" in bar else bar.get("highest"))
+            low_price = float(bar["low"] if "low" in bar else bar.get("lowest"))
+            close_price = float(bar["close"] if "close" in bar else bar.get("price"))
         except (TypeError, ValueError):
             self.logger.debug("QQ provider returned incomplete data for %s", symbol)
             return None
-        volume = float(bar.get("volume", bar.get("vol", 0)))
-        turnover = float(bar.get("turnover", bar.get("turn", 0)))
-        return ProviderResult(
+        volume = float(bar["volume"] if "volume" in bar else bar.get("vol", 0))
+        turnover = float(bar["turnover"] if "turnover" in bar else bar.get("turn", 0))
+        return ProviderResult.normalized(
             symbol=symbol,
             trade_date=trade_date,
             open=open_price,
@@ -79,12 +75,11 @@ class QQProvider(BaseProvider):
 
     async def fetch_daily(self, symbol: str, trade_date: date) -> Optional[ProviderResult]:
         await self._apply_rate_limit()
-        request = self._with_retry(self._request_daily)
-        payload = await request(symbol, trade_date)
+        payload = await self._retrying_request_daily(symbol, trade_date)
         if not payload:
             return None
         return self._parse_payload(symbol, trade_date, payload)
 
     async def close(self) -> None:
-        if self._owns_client and self._client is not None:
+        if self._owns_client:
             await self._client.aclose()
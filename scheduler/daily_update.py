@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import date
-from typing import Iterable, Sequence
+from typing import Iterable, Optional, Sequence
 
 from Ashare_data.fetchers.daily import DailyFetcher
+from Ashare_data.providers.base import ProviderResult
 from Ashare_data.storage.sqlite import SQLiteStorage
+from Ashare_data.utils.config import get_settings
 from Ashare_data.utils.logging import get_logger
 
 
@@ -23,19 +26,24 @@ async def run_daily_update(
         symbols = await storage.list_tracked_symbols()
         logger.debug("Loaded %d tracked symbols from storage", len(symbols))
     missing_map = await _compute_missing(storage, symbols, trade_date)
-    for symbol, should_fetch in missing_map.items():
-        if not should_fetch:
-            continue
-        bar = await fetcher.fetch(symbol, trade_date)
-        if bar:
-            await storage.upsert_daily_bars([bar])
-            logger.debug("Updated %s for %s", symbol, trade_date)
+    semaphore = asyncio.Semaphore(get_settings().max_concurrency)
+
+    async def _fetch_one(symbol: str) -> Optional[ProviderResult]:
+        async with semaphore:
+            return await fetcher.fetch(symbol, trade_date)
+
+    results = await asyncio.gather(
+        *(_fetch_one(symbol) for symbol, should_fetch in missing_map.items() if should_fetch)
+    )
+    bars = [bar for bar in results if bar]
+    if bars:
+        await storage.upsert_daily_bars(bars)
+        for bar in bars:
+            logger.debug("Updated %s for %s", bar.symbol, trade_date)
     logger.info("Daily update complete for %s", trade_date)
 
 
 async def _compute_missing(storage: SQLiteStorage, symbols: Iterable[str], trade_date: date) -> dict[str, bool]:
-    result: dict[str, bool] = {}
-    for symbol in symbols:
-        missing = await storage.missing_daily_dates(symbol, [trade_date])
-        result[symbol] = bool(missing)
-    return result
+    symbols = list(symbols)
+    present = await storage.symbols_present_on(trade_date, symbols)
+    return {symbol: symbol not in present for symbol in symbols}
@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+import asyncio
+from datetime import date, datetime
 from pathlib import Path
-from typing import List, Sequence
+from typing import List, Optional, Sequence
 
 from Ashare_data.fetchers.daily import DailyFetcher
+from Ashare_data.providers.base import ProviderResult
 from Ashare_data.storage.sqlite import SQLiteStorage
 from Ashare_data.utils.config import get_settings
 from Ashare_data.utils.logging import get_logger
 
+# Number of buffered bars written per ``upsert_daily_bars`` transaction.
+_FLUSH_SIZE = 5_000
+
 
 async def run_initial_load(
     storage: SQLiteStorage,
@@ -23,16 +28,26 @@ async def run_initial_load(
 
     logger = get_logger("Ashare.scheduler.initializer")
     calendar = load_trading_calendar(start, end)
+    semaphore = asyncio.Semaphore(get_settings().max_concurrency)
     logger.info("Starting initial load for %d symbols (%s -> %s)", len(symbols), start, end)
+
+    async def _fetch_one(symbol: str, trade_date: date) -> Optional[ProviderResult]:
+        async with semaphore:
+            return await fetcher.fetch(symbol, trade_date)
+
+    pending: List[ProviderResult] = []
     for symbol in symbols:
-        bars = []
-        for trade_date in calendar:
-            result = await fetcher.fetch(symbol, trade_date)
-            if result:
-                bars.append(result)
-        if bars:
-            await storage.upsert_daily_bars(bars)
-            logger.debug("Inserted %d bars for %s", len(bars), symbol)
+        results = await asyncio.gather(*(_fetch_one(symbol, trade_date) for trade_date in calendar))
+        bars = [result for result in results if result]
+        logger.debug("Fetched %d bars for %s", len(bars), symbol)
+        pending.extend(bars)
+        if len(pending) >= _FLUSH_SIZE:
+            await storage.upsert_daily_bars(pending)
+            logger.debug("Inserted %d bars", len(pending))
+            pending.clear()
+    if pending:
+        await storage.upsert_daily_bars(pending)
+        logger.debug("Inserted %d bars", len(pending))
     logger.info("Initial load complete")
 
 
@@ -46,13 +61,12 @@ def load_trading_calendar(start: date, end: date) -> List[date]:
 
 
 def _calendar_from_weekdays(start: date, end: date) -> List[date]:
-    cursor = start
-    calendar: List[date] = []
-    while cursor <= end:
-        if cursor.weekday() < 5:  # Monday-Friday
-            calendar.append(cursor)
-        cursor += timedelta(days=1)
-    return calendar
+    # ``date.fromordinal(1)`` is a Monday, so ``(ordinal - 1) % 7`` is the weekday.
+    return [
+        date.fromordinal(ordinal)
+        for ordinal in range(start.toordinal(), end.toordinal() + 1)
+        if (ordinal - 1) % 7 < 5  # Monday-Friday
+    ]
 
 
 def _calendar_from_file(path: Path, start: date, end: date) -> List[date]:
@@ -63,9 +77,22 @@ def _calendar_from_file(path: Path, start: date, end: date) -> List[date]:
             if not line:
                 continue
             try:
-                current = datetime.strptime(line, "%Y-%m-%d").date()
+                current = _parse_calendar_date(line)
             except ValueError:
                 continue
             if start <= current <= end:
                 dates.append(current)
     return dates
+
+
+def _parse_calendar_date(line: str) -> date:
+    # ``date.fromisoformat`` is much cheaper than ``strptime`` but on Python
+    # 3.11+ also accepts compact and ISO week forms, so it only gets the zero
+    # padded ``YYYY-MM-DD`` shape.  Anything else (e.g. ``2024-1-2``) goes
+    # through ``strptime`` as before.
+    if len(line) == 10 and line[4] == "-" and line[7] == "-":
+        try:
+            return date.fromisoformat(line)
+        except ValueError:
+            pass
+    return datetime.strptime(line, "%Y-%m-%d").date()
@@ -4,14 +4,146 @@ from __future__ import annotations
 
 import asyncio
 import sqlite3
-from dataclasses import dataclass
+import sys
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
-from typing import Any, Iterable, List, Optional, Sequence
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional, Sequence, TypeVar
 
 from Ashare_data.providers.base import ProviderResult
 from Ashare_data.utils.config import get_settings
 from Ashare_data.utils.logging import get_logger
+from Ashare_data.utils.serialization import json_dumps  # noqa: F401 - kept importable from here
+from Ashare_data.utils.serialization import json_dumps_bytes
+
+T = TypeVar("T")
+
+_MAX_QUERY_PARAMS = 900
+
+# Size of each connection's prepared statement cache.  The SQL below is kept
+# in module constants so every call re-uses the statement compiled on the
+# pooled connection instead of re-parsing it.
+_CACHED_STATEMENTS = 256
+
+# Applied to the writer connection.  WAL plus ``synchronous=NORMAL`` only
+# fsyncs on checkpoints; the page cache (64 MiB) and memory map (256 MiB) keep
+# hot B-tree pages out of the VFS layer.
+_CONNECTION_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+PRAGMA wal_autocheckpoint=1000;
+PRAGMA foreign_keys=ON;
+"""
+
+# Read-only connections cannot change the journal mode or checkpoint, so they
+# only get the per-connection cache settings.
+_READER_PRAGMAS = """
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+"""
+
+# STRICT tables need SQLite 3.37+; older libraries get the same layout
+# without the extra type enforcement.
+_TABLE_OPTIONS = "WITHOUT ROWID, STRICT" if sqlite3.sqlite_version_info >= (3, 37, 0) else "WITHOUT ROWID"
+
+# Bumped whenever the on-disk layout changes; stored in ``PRAGMA user_version``.
+_SCHEMA_VERSION = 1
+
+# ``trade_date`` columns hold ``date.toordinal()`` values (days since
+# 0001-01-01).  ``WITHOUT ROWID`` clusters rows on the primary key, so
+# per-symbol range scans read the table B-tree directly and every lookup
+# below is a ``SEARCH ... USING PRIMARY KEY``; no secondary index is needed.
+_SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS securities (
+    symbol TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    listed_date TEXT,
+    delisted_date TEXT
+);
+
+CREATE TABLE IF NOT EXISTS daily_bars (
+    symbol TEXT NOT NULL,
+    trade_date INTEGER NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume REAL NOT NULL,
+    turnover REAL NOT NULL,
+    raw_payload BLOB,
+    PRIMARY KEY (symbol, trade_date)
+) {_TABLE_OPTIONS};
+
+CREATE TABLE IF NOT EXISTS adjustment_factors (
+    symbol TEXT NOT NULL,
+    trade_date INTEGER NOT NULL,
+    factor REAL NOT NULL,
+    PRIMARY KEY (symbol, trade_date)
+) {_TABLE_OPTIONS};
+
+PRAGMA user_version = {_SCHEMA_VERSION};
+"""
+
+# Rebuilds version 0 tables (ISO TEXT dates, rowid tables) in the new layout.
+# ``julianday('0001-01-01')`` is 1721425.5 and ``date.toordinal()`` numbers
+# that day 1, hence the offset.
+_MIGRATE_TO_V1_SQL = f"""
+BEGIN IMMEDIATE;
+ALTER TABLE daily_bars RENAME TO daily_bars_v0;
+ALTER TABLE adjustment_factors RENAME TO adjustment_factors_v0;
+{_SCHEMA_SQL}
+INSERT INTO daily_bars (symbol, trade_date, open, high, low, close, volume, turnover, raw_payload)
+SELECT symbol, CAST(julianday(trade_date) - 1721424.5 AS INTEGER), open, high, low, close, volume, turnover,
+       CAST(raw_payload AS BLOB)
+FROM daily_bars_v0;
+INSERT INTO adjustment_factors (symbol, trade_date, factor)
+SELECT symbol, CAST(julianday(trade_date) - 1721424.5 AS INTEGER), factor
+FROM adjustment_factors_v0;
+DROP TABLE daily_bars_v0;
+DROP TABLE adjustment_factors_v0;
+COMMIT;
+"""
+
+_UPSERT_SECURITIES_SQL = """
+INSERT INTO securities (symbol, name, asset_type, listed_date, delisted_date)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(symbol) DO UPDATE SET
+    name=excluded.name,
+    asset_type=excluded.asset_type,
+    listed_date=excluded.listed_date,
+    delisted_date=excluded.delisted_date
+"""
+
+_UPSERT_DAILY_BARS_SQL = """
+INSERT INTO daily_bars (symbol, trade_date, open, high, low, close, volume, turnover, raw_payload)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(symbol, trade_date) DO UPDATE SET
+    open=excluded.open,
+    high=excluded.high,
+    low=excluded.low,
+    close=excluded.close,
+    volume=excluded.volume,
+    turnover=excluded.turnover,
+    raw_payload=excluded.raw_payload
+"""
+
+_UPSERT_ADJUSTMENT_FACTORS_SQL = """
+INSERT INTO adjustment_factors (symbol, trade_date, factor)
+VALUES (?, ?, ?)
+ON CONFLICT(symbol, trade_date) DO UPDATE SET
+    factor=excluded.factor
+"""
+
+_LIST_SYMBOLS_SQL = "SELECT symbol FROM securities ORDER BY symbol"
+
+_EXISTING_DATES_SQL = "SELECT trade_date FROM daily_bars WHERE symbol = ? AND trade_date BETWEEN ? AND ?"
 
 
 @dataclass(slots=True)
@@ -25,188 +157,376 @@ class Security:
     delisted_date: Optional[date] = None
 
 
+@dataclass
+class _Transaction:
+    """Connection pinned by :meth:`SQLiteStorage.transaction`."""
+
+    conn: sqlite3.Connection
+    # Serialises tasks spawned inside the ``async with`` block, which inherit
+    # the transaction through their copied context.
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
 class SQLiteStorage:
-    """A small asynchronous wrapper around :mod:`sqlite3`."""
+    """A small asynchronous wrapper around :mod:`sqlite3`.
+
+    Writes go through a single long lived writer connection guarded by an
+    :class:`asyncio.Lock`.  Queries borrow one of up to ``pool_size``
+    read-only connections, so under WAL they neither wait for nor block a
+    running write.  Every blocking call runs in a worker thread via
+    :func:`asyncio.to_thread`.  Call :meth:`close` when done.
+
+    Each upsert commits once.  Wrap several calls in :meth:`transaction` to
+    share a single ``BEGIN IMMEDIATE`` / ``COMMIT`` between them.
+    """
 
-    def __init__(self, path: Optional[Path] = None) -> None:
+    def __init__(self, path: Optional[Path] = None, *, pool_size: Optional[int] = None) -> None:
         settings = get_settings()
         self._path = Path(path or settings.database_path)
         self._logger = get_logger("Ashare.storage.sqlite")
+        self._pool_size = pool_size if pool_size is not None else max(4, settings.max_concurrency)
+        if self._pool_size <= 0:
+            raise ValueError("pool_size must be positive")
+        # Created per event loop by ``_bind_loop``.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pool: Optional[asyncio.Queue[sqlite3.Connection]] = None
+        self._connections: List[sqlite3.Connection] = []
+        self._opening = 0
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._transaction: ContextVar[Optional[_Transaction]] = ContextVar(
+            f"ashare_sqlite_transaction_{id(self)}", default=None
+        )
 
-    async def initialize(self) -> None:
-        await asyncio.to_thread(self._initialize_sync)
+    def _connect(self, mode: str = "rwc") -> sqlite3.Connection:
+        """Open a tuned connection to the database in URI ``mode``.
 
-    def _initialize_sync(self) -> None:
-        self._logger.debug("Creating SQLite schema at %s", self._path)
-        conn = sqlite3.connect(self._path)
+        ``isolation_level=None`` keeps :mod:`sqlite3` from injecting its own
+        ``BEGIN`` before DML statements; writes open their transaction
+        explicitly with ``BEGIN IMMEDIATE`` instead.
+        """
+
+        conn = sqlite3.connect(
+            f"{self._path.absolute().as_uri()}?mode={mode}",
+            uri=True,
+            cached_statements=_CACHED_STATEMENTS,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.executescript(_READER_PRAGMAS if mode == "ro" else _CONNECTION_PRAGMAS)
+        return conn
+
+    def _bind_loop(self) -> None:
+        # The queue and lock belong to the loop that first waits on them, so
+        # fresh ones are created when the storage is reused from a different
+        # event loop (e.g. successive ``asyncio.run`` calls).  Connections are
+        # idle between loops and carry over.
+        loop = asyncio.get_running_loop()
+        if loop is self._loop:
+            return
+        self._loop = loop
+        self._pool = asyncio.Queue()
+        for conn in self._connections:
+            self._pool.put_nowait(conn)
+        self._opening = 0
+        self._write_lock = asyncio.Lock()
+
+    def _get_write_lock(self) -> asyncio.Lock:
+        self._bind_loop()
+        return self._write_lock
+
+    async def _open_writer(self) -> sqlite3.Connection:
+        # Callers hold the write lock.
+        if self._writer is None:
+            self._writer = await asyncio.to_thread(self._connect)
+        return self._writer
+
+    async def _acquire(self) -> sqlite3.Connection:
+        """Borrow a read-only connection from the pool."""
+
+        self._bind_loop()
+        if self._pool.empty() and len(self._connections) + self._opening < self._pool_size:
+            self._opening += 1
+            try:
+                # The writer creates the database and keeps its WAL files
+                # around, which read-only connections cannot do themselves.
+                if self._writer is None:
+                    async with self._get_write_lock():
+                        await self._open_writer()
+                conn = await asyncio.to_thread(self._connect, "ro")
+            finally:
+                self._opening -= 1
+            self._connections.append(conn)
+            return conn
+        return await self._pool.get()
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if self._pool is not None:
+            self._pool.put_nowait(conn)
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run the query ``func(conn, *args)`` in a worker thread on a reader.
+
+        Inside :meth:`transaction` the transaction's connection is used, so the
+        query sees the transaction's own uncommitted writes.
+        """
+
+        transaction = self._transaction.get()
+        if transaction is not None:
+            async with transaction.lock:
+                return await _to_thread(transaction.conn, func, *args)
+        conn = await self._acquire()
         try:
-            conn.execute("PRAGMA journal_mode=WAL;")
-            conn.execute("PRAGMA foreign_keys=ON;")
-            conn.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS securities (
-                    symbol TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    asset_type TEXT NOT NULL,
-                    listed_date TEXT,
-                    delisted_date TEXT
-                );
-
-                CREATE TABLE IF NOT EXISTS daily_bars (
-                    symbol TEXT NOT NULL,
-                    trade_date TEXT NOT NULL,
-                    open REAL NOT NULL,
-                    high REAL NOT NULL,
-                    low REAL NOT NULL,
-                    close REAL NOT NULL,
-                    volume REAL NOT NULL,
-                    turnover REAL NOT NULL,
-                    raw_payload TEXT,
-                    PRIMARY KEY (symbol, trade_date)
-                );
-
-                CREATE TABLE IF NOT EXISTS adjustment_factors (
-                    symbol TEXT NOT NULL,
-                    trade_date TEXT NOT NULL,
-                    factor REAL NOT NULL,
-                    PRIMARY KEY (symbol, trade_date)
-                );
-                """
-            )
-            conn.commit()
+            return await _to_thread(conn, func, *args)
         finally:
-            conn.close()
+            self._release(conn)
+
+    async def _run_writer(self, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func(conn, *args)`` in a worker thread on the writer connection."""
+
+        if self._transaction.get() is not None:
+            # The enclosing transaction holds the write lock, which is not reentrant.
+            raise RuntimeError("this storage call cannot be made inside transaction()")
+        async with self._get_write_lock():
+            conn = await self._open_writer()
+            return await _to_thread(conn, func, *args)
+
+    async def _write(self, func: Callable[..., None], *args: Any) -> None:
+        """Run ``func(conn, *args)`` on the writer in its own write transaction.
+
+        Inside :meth:`transaction` the outer transaction is joined instead.
+        """
+
+        if self._transaction.get() is not None:
+            await self._run(func, *args)
+        else:
+            await self._run_writer(_in_transaction, func, *args)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """Group storage calls made in the block into one write transaction.
+
+        The transaction starts with ``BEGIN IMMEDIATE`` and is committed when
+        the block exits, or rolled back if it raises.  Nested blocks join the
+        outer transaction.  The writer stays locked for the whole block; reads
+        from other tasks keep running on the reader connections.
+        """
 
+        if self._transaction.get() is not None:
+            yield
+            return
+        async with self._get_write_lock():
+            conn = await self._open_writer()
+            token = self._transaction.set(_Transaction(conn))
+            try:
+                try:
+                    # Inside the ``try``: if the caller is cancelled just as
+                    # BEGIN succeeds the transaction must still be closed.
+                    await _to_thread(conn, _execute, "BEGIN IMMEDIATE")
+                    yield
+                    await _to_thread(conn, _execute, "COMMIT")
+                except BaseException:
+                    await _to_thread(conn, _rollback)
+                    raise
+            finally:
+                self._transaction.reset(token)
+
+    async def close(self) -> None:
+        """Close the reader pool and the writer connection.
+
+        The writer runs ``PRAGMA optimize`` first so the query planner
+        statistics follow the growth of the tables.  Pending storage calls must
+        have finished before this is awaited.
+        """
+
+        connections, self._connections = self._connections, []
+        self._loop = None
+        self._pool = None
+        for conn in connections:
+            await asyncio.to_thread(conn.close)
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            await asyncio.to_thread(_optimize_and_close, writer)
+
+    async def initialize(self) -> None:
+        await self._run_writer(self._initialize_sync)
+
+    def _initialize_sync(self, conn: sqlite3.Connection) -> None:
+        self._logger.debug("Creating SQLite schema at %s", self._path)
+        (version,) = conn.execute("PRAGMA user_version;").fetchone()
+        if version < _SCHEMA_VERSION and _table_exists(conn, "daily_bars"):
+            self._logger.info("Migrating SQLite schema at %s to version %d", self._path, _SCHEMA_VERSION)
+            try:
+                conn.executescript(_MIGRATE_TO_V1_SQL)
+            except sqlite3.Error:
+                _rollback(conn)
+                raise
+            # The rebuilt tables have no planner statistics yet.
+            conn.execute("ANALYZE;")
+        conn.executescript(_SCHEMA_SQL)
+        conn.execute("PRAGMA optimize;")
+
+    # Rows are built inside the worker thread, one at a time as
+    # ``executemany`` binds them, so large batches neither stall the event
+    # loop nor exist twice in memory.
     async def upsert_securities(self, securities: Iterable[Security]) -> None:
-        records = [
-            (
-                security.symbol,
-                security.name,
-                security.asset_type,
-                security.listed_date.isoformat() if security.listed_date else None,
-                security.delisted_date.isoformat() if security.delisted_date else None,
-            )
-            for security in securities
-        ]
-        if not records:
+        securities = list(securities)
+        if not securities:
             return
-        await asyncio.to_thread(self._upsert_securities_sync, records)
+        await self._write(self._upsert_securities_sync, securities)
 
-    def _upsert_securities_sync(self, records: Sequence[tuple]) -> None:
-        conn = sqlite3.connect(self._path)
-        try:
-            with conn:
-                conn.executemany(
-                    """
-                    INSERT INTO securities (symbol, name, asset_type, listed_date, delisted_date)
-                    VALUES (?, ?, ?, ?, ?)
-                    ON CONFLICT(symbol) DO UPDATE SET
-                        name=excluded.name,
-                        asset_type=excluded.asset_type,
-                        listed_date=excluded.listed_date,
-                        delisted_date=excluded.delisted_date
-                    """,
-                    records,
-                )
-        finally:
-            conn.close()
+    def _upsert_securities_sync(self, conn: sqlite3.Connection, securities: Sequence[Security]) -> None:
+        conn.executemany(_UPSERT_SECURITIES_SQL, map(_security_to_row, securities))
 
     async def upsert_daily_bars(self, bars: Iterable[ProviderResult]) -> None:
-        records = [
-            (
-                bar.symbol,
-                bar.trade_date.isoformat(),
-                bar.open,
-                bar.high,
-                bar.low,
-                bar.close,
-                bar.volume,
-                bar.turnover,
-                json_dumps(bar.raw),
-            )
-            for bar in bars
-        ]
-        if not records:
+        bars = list(bars)
+        if not bars:
             return
-        await asyncio.to_thread(self._upsert_daily_bars_sync, records)
+        await self._write(self._upsert_daily_bars_sync, bars)
 
-    def _upsert_daily_bars_sync(self, records: Sequence[tuple]) -> None:
-        conn = sqlite3.connect(self._path)
-        try:
-            with conn:
-                conn.executemany(
-                    """
-                    INSERT INTO daily_bars (symbol, trade_date, open, high, low, close, volume, turnover, raw_payload)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(symbol, trade_date) DO UPDATE SET
-                        open=excluded.open,
-                        high=excluded.high,
-                        low=excluded.low,
-                        close=excluded.close,
-                        volume=excluded.volume,
-                        turnover=excluded.turnover,
-                        raw_payload=excluded.raw_payload
-                    """,
-                    records,
-                )
-        finally:
-            conn.close()
+    def _upsert_daily_bars_sync(self, conn: sqlite3.Connection, bars: Sequence[ProviderResult]) -> None:
+        conn.executemany(_UPSERT_DAILY_BARS_SQL, map(_bar_to_row, bars))
 
     async def upsert_adjustment_factors(self, factors: Iterable[tuple[str, date, float]]) -> None:
-        records = [
-            (
-                symbol,
-                trade_date.isoformat(),
-                float(value),
-            )
-            for symbol, trade_date, value in factors
-        ]
-        if not records:
+        factors = list(factors)
+        if not factors:
             return
-        await asyncio.to_thread(self._upsert_adjustment_factors_sync, records)
+        await self._write(self._upsert_adjustment_factors_sync, factors)
 
-    def _upsert_adjustment_factors_sync(self, records: Sequence[tuple]) -> None:
-        conn = sqlite3.connect(self._path)
-        try:
-            with conn:
-                conn.executemany(
-                    """
-                    INSERT INTO adjustment_factors (symbol, trade_date, factor)
-                    VALUES (?, ?, ?)
-                    ON CONFLICT(symbol, trade_date) DO UPDATE SET
-                        factor=excluded.factor
-                    """,
-                    records,
-                )
-        finally:
-            conn.close()
+    def _upsert_adjustment_factors_sync(self, conn: sqlite3.Connection, factors: Sequence[tuple[str, date, float]]) -> None:
+        conn.executemany(_UPSERT_ADJUSTMENT_FACTORS_SQL, map(_factor_to_row, factors))
 
     async def list_tracked_symbols(self) -> List[str]:
-        return await asyncio.to_thread(self._list_tracked_symbols_sync)
+        return await self._run(self._list_tracked_symbols_sync)
 
-    def _list_tracked_symbols_sync(self) -> List[str]:
-        conn = sqlite3.connect(self._path)
-        try:
-            cursor = conn.execute("SELECT symbol FROM securities ORDER BY symbol")
-            return [row[0] for row in cursor.fetchall()]
-        finally:
-            conn.close()
+    def _list_tracked_symbols_sync(self, conn: sqlite3.Connection) -> List[str]:
+        return [row[0] for row in conn.execute(_LIST_SYMBOLS_SQL)]
 
     async def missing_daily_dates(self, symbol: str, dates: Iterable[date]) -> List[date]:
-        existing = await asyncio.to_thread(self._existing_dates_sync, symbol)
-        missing = [trade_date for trade_date in dates if trade_date.isoformat() not in existing]
+        dates = list(dates)
+        if not dates:
+            return []
+        existing = await self._run(self._existing_dates_sync, symbol, min(dates).toordinal(), max(dates).toordinal())
+        missing = [trade_date for trade_date in dates if trade_date.toordinal() not in existing]
         return missing
 
-    def _existing_dates_sync(self, symbol: str) -> set[str]:
-        conn = sqlite3.connect(self._path)
-        try:
-            cursor = conn.execute("SELECT trade_date FROM daily_bars WHERE symbol = ?", (symbol,))
-            return {row[0] for row in cursor.fetchall()}
-        finally:
-            conn.close()
+    def _existing_dates_sync(self, conn: sqlite3.Connection, symbol: str, start: int, end: int) -> set[int]:
+        return {row[0] for row in conn.execute(_EXISTING_DATES_SQL, (symbol, start, end))}
+
+    async def symbols_present_on(self, trade_date: date, symbols: Sequence[str]) -> set[str]:
+        """Return the subset of ``symbols`` that already have a bar on ``trade_date``."""
+
+        if not symbols:
+            return set()
+        return await self._run(self._symbols_present_on_sync, trade_date.toordinal(), list(symbols))
+
+    def _symbols_present_on_sync(self, conn: sqlite3.Connection, trade_date: int, symbols: List[str]) -> set[str]:
+        present: set[str] = set()
+        # Stay below SQLite's default host parameter limit.
+        for offset in range(0, len(symbols), _MAX_QUERY_PARAMS):
+            chunk = symbols[offset : offset + _MAX_QUERY_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"SELECT symbol FROM daily_bars WHERE trade_date = ? AND symbol IN ({placeholders})",
+                (trade_date, *chunk),
+            )
+            present.update(row[0] for row in cursor)
+        return present
+
+
+async def _to_thread(conn: sqlite3.Connection, func: Callable[..., T], *args: Any) -> T:
+    """Run ``func(conn, *args)`` in a worker thread, even if the caller is cancelled.
+
+    The thread itself cannot be cancelled and keeps using ``conn``.  On
+    cancellation its current statement is interrupted and the caller waits for
+    the thread to return, so the connection (or the lock guarding it) is only
+    handed on once it is idle again.
+    """
+
+    future = asyncio.ensure_future(asyncio.to_thread(func, conn, *args))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        conn.interrupt()
+        while not future.done():
+            try:
+                await asyncio.wait((future,))
+            except asyncio.CancelledError:
+                pass
+        # The worker usually fails with "interrupted"; the cancellation wins.
+        if not future.cancelled():
+            future.exception()
+        raise
+
+
+def _execute(conn: sqlite3.Connection, sql: str) -> None:
+    conn.execute(sql)
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    cursor = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+    return cursor.fetchone() is not None
+
+
+# Row builders used with ``map``.  The default arguments bind the helpers as
+# locals so building a row does no global or attribute lookups for them.
+# Symbols and asset types repeat across many rows and are interned so each
+# distinct value is a single ``str`` object.
+def _bar_to_row(
+    bar: ProviderResult, _ordinal: Callable[[date], int] = date.toordinal, _intern: Callable[[str], str] = sys.intern
+) -> tuple:
+    raw = bar.raw
+    return (
+        _intern(bar.symbol),
+        _ordinal(bar.trade_date),
+        bar.open,
+        bar.high,
+        bar.low,
+        bar.close,
+        bar.volume,
+        bar.turnover,
+        None if raw is None else json_dumps_bytes(raw),
+    )
+
+
+def _security_to_row(
+    security: Security, _iso: Callable[[date], str] = date.isoformat, _intern: Callable[[str], str] = sys.intern
+) -> tuple:
+    listed_date = security.listed_date
+    delisted_date = security.delisted_date
+    return (
+        _intern(security.symbol),
+        security.name,
+        _intern(security.asset_type),
+        _iso(listed_date) if listed_date else None,
+        _iso(delisted_date) if delisted_date else None,
+    )
+
+
+def _factor_to_row(factor: tuple[str, date, float], _ordinal: Callable[[date], int] = date.toordinal) -> tuple:
+    symbol, trade_date, value = factor
+    return (symbol, _ordinal(trade_date), float(value))
+
+
+def _optimize_and_close(conn: sqlite3.Connection) -> None:
+    try:
+        conn.execute("PRAGMA optimize;")
+    finally:
+        conn.close()
+
 
+def _in_transaction(conn: sqlite3.Connection, func: Callable[..., None], *args: Any) -> None:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        func(conn, *args)
+        conn.execute("COMMIT")
+    except BaseException:
+        _rollback(conn)
+        raise
 
-def json_dumps(data: Any) -> str:
-    import json
 
-    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+def _rollback(conn: sqlite3.Connection) -> None:
+    # SQLite already rolls back by itself after some errors (``SQLITE_FULL``,
+    # ``SQLITE_IOERR``, ...), in which case a bare ``ROLLBACK`` would fail.
+    if conn.in_transaction:
+        conn.execute("ROLLBACK")
@@ -0,0 +1,15 @@
+"""Shared pytest configuration.
+
+In this checkout the subpackages (``providers``, ``storage``, ``utils``, ...)
+live next to ``Ashare_data/`` while the code imports them as
+``Ashare_data.<name>``.  Extend the package path so those imports resolve the
+same way they do in an installed tree.
+"""
+
+from pathlib import Path
+
+import Ashare_data
+
+_ROOT = str(Path(__file__).resolve().parents[1])
+if _ROOT not in Ashare_data.__path__:
+    Ashare_data.__path__.append(_ROOT)
@@ -1,4 +1,6 @@
 import asyncio
+import threading
+import time
 
 import httpx
 import pytest
@@ -100,3 +102,96 @@ def test_invalid_json_results_in_error():
 
     with pytest.raises(AshareClientError):
         asyncio.run(client.fetch_stock_list_async())
+
+
+def test_sync_requests_reuse_pooled_client():
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"data": []})
+
+    with AshareClient(base_url="https://api.example.com", transport=httpx.MockTransport(handler)) as client:
+        client.fetch_stock_list()
+        pooled = client._sync_client
+        client.fetch_daily_kline("000001.SZ")
+        assert pooled is not None
+        assert client._sync_client is pooled
+
+    assert client._sync_client is None
+
+
+def test_rate_limit_allows_burst_then_throttles():
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"data": []})
+
+    client = AshareClient(
+        base_url="https://api.example.com",
+        rate_limit_per_second=20,
+        rate_limit_burst=2,
+        transport=httpx.MockTransport(handler),
+    )
+
+    started = time.monotonic()
+    client.fetch_stock_list()
+    client.fetch_stock_list()
+    burst_elapsed = time.monotonic() - started
+    client.fetch_stock_list()
+    total_elapsed = time.monotonic() - started
+
+    assert burst_elapsed < 0.04
+    assert total_elapsed >= 0.04
+
+
+def test_async_rate_limit_works_across_event_loops():
+    def handler(_: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"data": []})
+
+    client = AshareClient(
+        base_url="https://api.example.com",
+        rate_limit_per_second=100,
+        transport=httpx.MockTransport(handler),
+    )
+
+    assert asyncio.run(client.fetch_stock_list_async()) == {"data": []}
+    assert asyncio.run(client.fetch_stock_list_async()) == {"data": []}
+
+
+def test_sync_client_is_created_once_across_threads():
+    client = AshareClient(base_url="https://api.example.com")
+    barrier = threading.Barrier(8)
+    created = []
+
+    def worker() -> None:
+        barrier.wait()
+        created.append(client._get_sync_client())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(pooled) for pooled in created}) == 1
+    client.close()
+
+
+def test_async_client_from_previous_running_loop_is_closed():
+    client = AshareClient(base_url="https://api.example.com")
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever)
+    thread.start()
+    try:
+
+        async def get_pool() -> httpx.AsyncClient:
+            return client._get_async_client()
+
+        previous = asyncio.run_coroutine_threadsafe(get_pool(), other_loop).result()
+        current = asyncio.run(get_pool())
+
+        assert current is not previous
+        deadline = time.monotonic() + 1
+        while not previous.is_closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert previous.is_closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
@@ -0,0 +1,18 @@
+import pytest
+
+from Ashare_data.utils.config import Settings
+
+
+def test_settings_parse_values_lazily_from_environment():
+    settings = Settings({"ASHARE_MAX_CONCURRENCY": "3", "ASHARE_HTTP_TIMEOUT": "not-a-number"})
+
+    assert settings.max_concurrency == 3
+    assert settings.retry_attempts == 3
+    with pytest.raises(ValueError):
+        settings.http_timeout
+
+
+@pytest.mark.parametrize("value", ["0", "-2"])
+def test_max_concurrency_must_be_positive(value):
+    with pytest.raises(ValueError, match="ASHARE_MAX_CONCURRENCY"):
+        Settings({"ASHARE_MAX_CONCURRENCY": value}).max_concurrency
@@ -0,0 +1,30 @@
+from datetime import date
+
+from Ashare_data.scheduler.initializer import _calendar_from_file, _calendar_from_weekdays
+
+
+def test_calendar_file_accepts_padded_and_unpadded_dates(tmp_path):
+    path = tmp_path / "calendar.txt"
+    path.write_text("2024-01-02\n2024-1-3\n\n 2024-01-4 \n2023-12-29\n2024-02-01\n", encoding="utf-8")
+
+    assert _calendar_from_file(path, date(2024, 1, 1), date(2024, 1, 31)) == [
+        date(2024, 1, 2),
+        date(2024, 1, 3),
+        date(2024, 1, 4),
+    ]
+
+
+def test_calendar_file_rejects_non_calendar_iso_forms(tmp_path):
+    # Python 3.11+ ``date.fromisoformat`` would accept these; ``strptime`` does not.
+    path = tmp_path / "calendar.txt"
+    path.write_text("20240102\n2024-W01-3\n2024-13-01\ntrade_date\n2024-01-05\n", encoding="utf-8")
+
+    assert _calendar_from_file(path, date(2024, 1, 1), date(2024, 1, 31)) == [date(2024, 1, 5)]
+
+
+def test_weekday_calendar_skips_weekends():
+    assert _calendar_from_weekdays(date(2024, 1, 5), date(2024, 1, 9)) == [
+        date(2024, 1, 5),
+        date(2024, 1, 8),
+        date(2024, 1, 9),
+    ]
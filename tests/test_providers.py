@@ -0,0 +1,183 @@
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+
+from Ashare_data.providers import base
+from Ashare_data.providers.eastmoney import EastMoneyProvider
+from Ashare_data.providers.qq import QQProvider
+from Ashare_data.utils.config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "retry_attempts", 3)
+    monkeypatch.setattr(settings, "retry_base_delay", 0.0)
+
+
+def _qq_payload(close: float) -> dict:
+    return {"data": {"open": close, "high": close, "low": close, "close": close, "volume": 10, "turnover": 20}}
+
+
+def test_qq_fetch_daily_retries_rate_limited_responses():
+    calls = {"count": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["count"] += 1
+        assert request.url.params["reqDay"] == "2024-01-02"
+        if calls["count"] == 1:
+            return httpx.Response(429)
+        return httpx.Response(200, json=_qq_payload(10.0))
+
+    async def scenario() -> None:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            provider = QQProvider(client=client)
+            retrying = provider._retrying_request_daily
+            result = await provider.fetch_daily("600000.SH", date(2024, 1, 2))
+            assert result is not None and result.close == 10.0
+            await provider.fetch_daily("600000.SH", date(2024, 1, 2))
+            assert provider._retrying_request_daily is retrying
+
+    asyncio.run(scenario())
+    assert calls["count"] == 3
+
+
+class _Validated:
+    """MockTransport handler serving versioned JSON with ETag/Last-Modified."""
+
+    def __init__(self) -> None:
+        self.requests = []
+        self.with_validators = True
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        etag = f'"{path}-v1"'
+        if self.with_validators and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        headers = {"ETag": etag, "Last-Modified": "Tue, 02 Jan 2024 08:00:00 GMT"} if self.with_validators else {}
+        return httpx.Response(200, json={"path": path, "count": len(self.requests)}, headers=headers)
+
+
+def _get_json(handler, urls, params=None):
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            provider = QQProvider(client=client)
+            return provider, [await provider._get_json(client, url, params, 5.0) for url in urls]
+
+    return asyncio.run(scenario())
+
+
+def test_get_json_revalidates_and_reuses_cached_payload():
+    handler = _Validated()
+    urls = ["https://quotes.example.com/a"] * 2
+    provider, payloads = _get_json(handler, urls, params={"symbol": "600000.SH"})
+
+    first, second = handler.requests
+    assert "If-None-Match" not in first.headers
+    assert second.headers["If-None-Match"] == '"/a-v1"'
+    assert second.headers["If-Modified-Since"] == "Tue, 02 Jan 2024 08:00:00 GMT"
+    assert second.url.params["symbol"] == "600000.SH"
+    # The 304 body is empty; the payload decoded from the first response is returned.
+    assert payloads == [{"path": "/a", "count": 1}, {"path": "/a", "count": 1}]
+    assert len(provider._validators) == 1
+
+
+def test_get_json_evicts_least_recently_used_validators(monkeypatch):
+    monkeypatch.setattr(base, "_VALIDATOR_CACHE_SIZE", 2)
+    handler = _Validated()
+    urls = [f"https://quotes.example.com/{name}" for name in ("a", "b", "a", "c", "b")]
+    provider, payloads = _get_json(handler, urls)
+
+    sent = [request.headers.get("If-None-Match") for request in handler.requests]
+    # "a" is revalidated, "b" was evicted when "c" arrived and is fetched afresh.
+    assert sent == [None, None, '"/a-v1"', None, None]
+    assert [payload["count"] for payload in payloads] == [1, 2, 1, 4, 5]
+    assert [key[0].rsplit("/", 1)[1] for key in provider._validators] == ["c", "b"]
+
+
+def test_get_json_drops_entries_without_validators():
+    handler = _Validated()
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            provider = QQProvider(client=client)
+            url = "https://quotes.example.com/a"
+            await provider._get_json(client, url, None, 5.0)
+            assert len(provider._validators) == 1
+            handler.with_validators = False
+            payload = await provider._get_json(client, url, None, 5.0)
+            assert payload["count"] == 2
+            assert not provider._validators
+            await provider._get_json(client, url, None, 5.0)
+
+    asyncio.run(scenario())
+    assert [request.headers.get("If-None-Match") for request in handler.requests] == [None, '"/a-v1"', None]
+
+
+def test_eastmoney_fetch_range_requests_window_and_filters_rows():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        klines = [
+            "2023-12-29,9.0,9.5,9.8,8.9,100,1000",
+            "2024-01-02,10.0,10.5,10.8,9.9,200,2000",
+            "2024-01-03,10.5,,10.9,10.1,300,3000",
+            "2024-01-04,10.6,11.0,11.2,10.4,400,4000",
+            "not-a-date,1,1,1,1,1,1",
+            "2024-01-08,11.0,11.1,11.3,10.9,500,5000",
+        ]
+        return httpx.Response(200, json={"data": {"klines": klines}})
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            provider = EastMoneyProvider(client=client)
+            return await provider.fetch_range("1.600000", date(2024, 1, 2), date(2024, 1, 5))
+
+    results = asyncio.run(scenario())
+
+    (request,) = requests
+    assert request.url.params["secid"] == "1.600000"
+    assert request.url.params["beg"] == "20240102"
+    assert request.url.params["end"] == "20240105"
+    assert request.url.params["klt"] == "101"
+    # Rows outside the window, with unparsable dates or malformed prices are skipped.
+    assert sorted(results) == [date(2024, 1, 2), date(2024, 1, 4)]
+    bar = results[date(2024, 1, 4)]
+    assert (bar.symbol, bar.open, bar.close, bar.high, bar.low) == ("1.600000", 10.6, 11.0, 11.2, 10.4)
+    assert (bar.volume, bar.turnover) == (400.0, 4000.0)
+    assert bar.raw == {"kline": "2024-01-04,10.6,11.0,11.2,10.4,400,4000"}
+
+
+def test_eastmoney_fetch_daily_indexes_revalidated_payload_once():
+    klines = [
+        "2024-01-02,10.0,10.5,10.8,9.9,200,2000",
+        "2024-01-03,10.5,10.7,10.9,10.1,300,3000",
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"data": {"klines": klines}}, headers={"ETag": '"v1"'})
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            provider = EastMoneyProvider(client=client)
+            first = await provider.fetch_daily("1.600000", date(2024, 1, 3))
+            (cached,) = provider._validators.values()
+            index = cached[2]
+            # A one-off lookup scans; the index is only built once the payload is reused.
+            assert index._index is None
+            second = await provider.fetch_daily("1.600000", date(2024, 1, 2))
+            assert index._index is not None
+            missing = await provider.fetch_daily("1.600000", date(2024, 1, 4))
+            return first, second, missing
+
+    first, second, missing = asyncio.run(scenario())
+    assert (first.trade_date, first.close) == (date(2024, 1, 3), 10.7)
+    assert (second.trade_date, second.close) == (date(2024, 1, 2), 10.5)
+    assert first.raw == {"data": {"klines": klines}}
+    assert missing is None
@@ -0,0 +1,135 @@
+import asyncio
+
+import httpx
+import pytest
+
+from Ashare_data.providers.base import _is_retryable
+from Ashare_data.utils import rate_limiter
+from Ashare_data.utils.rate_limiter import AsyncRateLimiter, async_retry
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Drive ``AsyncRateLimiter`` from a virtual clock that ``asyncio.sleep`` advances."""
+
+    clock = {"now": 100.0}
+
+    async def fake_sleep(delay: float) -> None:
+        clock["now"] += delay
+
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+    return clock
+
+
+def test_rate_limiter_allows_burst_then_spaces_calls(fake_clock):
+    limiter = AsyncRateLimiter(rate=5, per=0.25)
+    interval = 0.25 / 5
+
+    async def scenario() -> list:
+        stamps = []
+        for _ in range(8):
+            await limiter.acquire()
+            stamps.append(fake_clock["now"])
+        return stamps
+
+    stamps = asyncio.run(scenario())
+    assert stamps[:5] == [100.0] * 5
+    assert [stamp - stamps[4] for stamp in stamps[4:]] == pytest.approx([k * interval for k in range(4)])
+
+
+def test_rate_limiter_can_be_reused_across_event_loops():
+    limiter = AsyncRateLimiter(rate=1, per=0.01)
+
+    async def contend() -> None:
+        await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+
+    asyncio.run(contend())
+    asyncio.run(contend())
+
+
+def test_rate_limiter_rejects_invalid_configuration():
+    with pytest.raises(ValueError):
+        AsyncRateLimiter(rate=0, per=1)
+    with pytest.raises(ValueError):
+        AsyncRateLimiter(rate=1, per=0)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+
+    async def fake_sleep(delay: float) -> None:
+        recorded.append(delay)
+
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+def _flaky(failures: int, exc: BaseException):
+    calls = {"count": 0}
+
+    async def func() -> int:
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise exc
+        return calls["count"]
+
+    return func, calls
+
+
+def test_async_retry_backs_off_exponentially_up_to_max_delay(sleeps):
+    func, calls = _flaky(4, ValueError("temporary"))
+    wrapped = async_retry(attempts=5, base_delay=1.0, max_delay=3.0, jitter=False)(func)
+
+    assert asyncio.run(wrapped()) == 5
+    assert calls["count"] == 5
+    assert sleeps == [1.0, 2.0, 3.0, 3.0]
+
+
+def test_async_retry_jitter_stays_within_delay(sleeps):
+    func, _ = _flaky(3, ValueError("temporary"))
+    wrapped = async_retry(attempts=4, base_delay=1.0, max_delay=10.0)(func)
+
+    asyncio.run(wrapped())
+    assert len(sleeps) == 3
+    assert all(0 <= slept <= cap for slept, cap in zip(sleeps, (1.0, 2.0, 4.0)))
+
+
+def test_async_retry_reraises_after_last_attempt(sleeps):
+    func, calls = _flaky(10, ValueError("down"))
+    wrapped = async_retry(attempts=3, base_delay=0.5, jitter=False)(func)
+
+    with pytest.raises(ValueError, match="down"):
+        asyncio.run(wrapped())
+    assert calls["count"] == 3
+    assert sleeps == [0.5, 1.0]
+
+
+def test_async_retry_respects_retry_on_veto(sleeps):
+    func, calls = _flaky(10, KeyError("permanent"))
+    wrapped = async_retry(attempts=3, jitter=False, retry_on=lambda exc: not isinstance(exc, KeyError))(func)
+
+    with pytest.raises(KeyError):
+        asyncio.run(wrapped())
+    assert calls["count"] == 1
+    assert sleeps == []
+
+
+def test_async_retry_with_single_attempt_returns_function_unchanged():
+    async def func() -> None:
+        return None
+
+    assert async_retry(attempts=1)(func) is func
+
+
+@pytest.mark.parametrize(
+    ("status", "retryable"),
+    [(400, False), (404, False), (408, True), (429, True), (500, True), (503, True)],
+)
+def test_is_retryable_only_vetoes_permanent_client_errors(status, retryable):
+    request = httpx.Request("GET", "https://example.com")
+    error = httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+    assert _is_retryable(error) is retryable
+    assert _is_retryable(httpx.ConnectError("refused", request=request)) is True
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from Ashare_data.providers.base import ProviderResult
+from Ashare_data.storage.sqlite import Security, SQLiteStorage
+
+
+_V0_SCHEMA = """
+CREATE TABLE securities (
+    symbol TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    listed_date TEXT,
+    delisted_date TEXT
+);
+CREATE TABLE daily_bars (
+    symbol TEXT NOT NULL,
+    trade_date TEXT NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume REAL NOT NULL,
+    turnover REAL NOT NULL,
+    raw_payload TEXT,
+    PRIMARY KEY (symbol, trade_date)
+);
+CREATE TABLE adjustment_factors (
+    symbol TEXT NOT NULL,
+    trade_date TEXT NOT NULL,
+    factor REAL NOT NULL,
+    PRIMARY KEY (symbol, trade_date)
+);
+"""
+
+
+def _bar(symbol: str, trade_date: date, close: float = 1.0) -> ProviderResult:
+    return ProviderResult(symbol, trade_date, close, close, close, close, 100.0, 1000.0, {"close": close})
+
+
+def test_cancelled_upsert_releases_writer_cleanly(tmp_path):
+    start = date(2000, 1, 1)
+    bars = [_bar(f"S{index % 300:03d}", start + timedelta(days=index // 300)) for index in range(300_000)]
+
+    async def scenario() -> None:
+        storage = SQLiteStorage(tmp_path / "ashare.sqlite3")
+        await storage.initialize()
+        task = asyncio.create_task(storage.upsert_daily_bars(bars))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        await storage.upsert_daily_bars([_bar("AAA", date(2024, 1, 2))])
+        assert await storage.missing_daily_dates("AAA", [date(2024, 1, 2)]) == []
+        await storage.close()
+
+    asyncio.run(scenario())
+
+
+def test_storage_can_be_reused_across_event_loops(tmp_path):
+    storage = SQLiteStorage(tmp_path / "ashare.sqlite3", pool_size=1)
+
+    async def scenario(trade_date: date) -> None:
+        await storage.initialize()
+        await asyncio.gather(
+            storage.upsert_daily_bars([_bar("AAA", trade_date)]),
+            storage.upsert_daily_bars([_bar("BBB", trade_date)]),
+            *(storage.missing_daily_dates("AAA", [trade_date]) for _ in range(4)),
+        )
+
+    asyncio.run(scenario(date(2024, 1, 2)))
+    asyncio.run(scenario(date(2024, 1, 3)))
+
+    async def check() -> None:
+        assert await storage.symbols_present_on(date(2024, 1, 3), ["AAA", "BBB"]) == {"AAA", "BBB"}
+        await storage.close()
+
+    asyncio.run(check())
+
+
+def test_initialize_migrates_version_0_database(tmp_path):
+    path = tmp_path / "ashare.sqlite3"
+    dates = [date(1999, 12, 31), date(2000, 1, 3), date(2024, 2, 29)]
+    conn = sqlite3.connect(path)
+    conn.executescript(_V0_SCHEMA)
+    conn.execute("INSERT INTO securities VALUES ('600000.SH', 'PF Bank', 'stock', '1999-11-10', NULL)")
+    conn.executemany(
+        "INSERT INTO daily_bars VALUES ('600000.SH', ?, 1, 2, 0.5, 1.5, 10, 20, ?)",
+        [(trade_date.isoformat(), json.dumps({"day": trade_date.isoformat()})) for trade_date in dates],
+    )
+    conn.execute("INSERT INTO adjustment_factors VALUES ('600000.SH', '2024-02-29', 1.25)")
+    conn.commit()
+    conn.close()
+
+    async def scenario() -> None:
+        storage = SQLiteStorage(path)
+        await storage.initialize()
+        assert await storage.list_tracked_symbols() == ["600000.SH"]
+        assert await storage.missing_daily_dates("600000.SH", [*dates, date(2024, 3, 1)]) == [date(2024, 3, 1)]
+        await storage.close()
+
+    asyncio.run(scenario())
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone() == (1,)
+    rows = conn.execute("SELECT trade_date, close, raw_payload FROM daily_bars ORDER BY trade_date").fetchall()
+    assert [date.fromordinal(row[0]) for row in rows] == dates
+    assert [row[1] for row in rows] == [1.5, 1.5, 1.5]
+    assert [json.loads(row[2]) for row in rows] == [{"day": trade_date.isoformat()} for trade_date in dates]
+    assert conn.execute("SELECT trade_date, factor FROM adjustment_factors").fetchall() == [
+        (date(2024, 2, 29).toordinal(), 1.25)
+    ]
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert not {"daily_bars_v0", "adjustment_factors_v0"} & tables
+    conn.close()
+
+
+def test_trade_dates_round_trip_as_ordinals(tmp_path):
+    path = tmp_path / "ashare.sqlite3"
+    dates = [date(1990, 12, 19), date(2020, 2, 28), date(2020, 2, 29), date(2020, 3, 2)]
+
+    async def scenario() -> None:
+        storage = SQLiteStorage(path)
+        await storage.initialize()
+        await storage.upsert_daily_bars([_bar("000001.SZ", trade_date) for trade_date in dates])
+        await storage.upsert_daily_bars([_bar("000001.SZ", date(2020, 2, 29), close=2.0)])
+        queried = [date(2020, 2, 27), *dates, date(2020, 3, 3)]
+        assert await storage.missing_daily_dates("000001.SZ", queried) == [date(2020, 2, 27), date(2020, 3, 3)]
+        assert await storage.missing_daily_dates("000002.SZ", dates) == dates
+        assert await storage.missing_daily_dates("000001.SZ", []) == []
+        await storage.close()
+
+    asyncio.run(scenario())
+
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT trade_date, close FROM daily_bars ORDER BY trade_date").fetchall()
+    conn.close()
+    assert [(date.fromordinal(ordinal), close) for ordinal, close in rows] == [
+        (date(1990, 12, 19), 1.0),
+        (date(2020, 2, 28), 1.0),
+        (date(2020, 2, 29), 2.0),
+        (date(2020, 3, 2), 1.0),
+    ]
+
+
+def test_symbols_present_on_spans_query_parameter_chunks(tmp_path):
+    trade_date = date(2024, 1, 2)
+    symbols = [f"{index:06d}.SZ" for index in range(2_000)]
+
+    async def scenario() -> None:
+        storage = SQLiteStorage(tmp_path / "ashare.sqlite3")
+        await storage.initialize()
+        await storage.upsert_daily_bars(_bar(symbol, trade_date) for symbol in symbols[::3])
+        await storage.upsert_daily_bars([_bar(symbols[1], trade_date + timedelta(days=1))])
+        assert await storage.symbols_present_on(trade_date, symbols) == set(symbols[::3])
+        assert await storage.symbols_present_on(trade_date, []) == set()
+        await storage.close()
+
+    asyncio.run(scenario())
+
+
+def test_transaction_commits_and_joins_nested_blocks(tmp_path):
+    path = tmp_path / "ashare.sqlite3"
+
+    async def scenario() -> None:
+        storage = SQLiteStorage(path)
+        other = SQLiteStorage(path)
+        await storage.initialize()
+        async with storage.transaction():
+            await storage.upsert_securities([Security("AAA", "Alpha", "stock")])
+            async with storage.transaction():
+                await storage.upsert_daily_bars([_bar("AAA", date(2024, 1, 2))])
+            # Reads inside the block see its own uncommitted writes, other
+            # connections only see committed data.
+            assert await storage.list_tracked_symbols() == ["AAA"]
+            assert await other.list_tracked_symbols() == []
+        assert await other.list_tracked_symbols() == ["AAA"]
+        assert await other.missing_daily_dates("AAA", [date(2024, 1, 2)]) == []
+        await other.close()
+        await storage.close()
+
+    asyncio.run(scenario())
+
+
+def test_transaction_rolls_back_on_error(tmp_path):
+    async def scenario() -> None:
+        storage = SQLiteStorage(tmp_path / "ashare.sqlite3")
+        await storage.initialize()
+        with pytest.raises(RuntimeError, match="boom"):
+            async with storage.transaction():
+                await storage.upsert_securities([Security("AAA", "Alpha", "stock")])
+                await storage.upsert_daily_bars([_bar("AAA", date(2024, 1, 2))])
+                raise RuntimeError("boom")
+        assert await storage.list_tracked_symbols() == []
+        assert await storage.missing_daily_dates("AAA", [date(2024, 1, 2)]) == [date(2024, 1, 2)]
+        # The writer is usable again afterwards.
+        await storage.upsert_securities([Security("BBB", "Beta", "stock")])
+        assert await storage.list_tracked_symbols() == ["BBB"]
+        await storage.close()
+
+    asyncio.run(scenario())
+
+
+def test_initialize_inside_transaction_raises(tmp_path):
+    async def scenario() -> None:
+        storage = SQLiteStorage(tmp_path / "ashare.sqlite3")
+        await storage.initialize()
+        async with storage.transaction():
+            with pytest.raises(RuntimeError, match="inside transaction"):
+                await asyncio.wait_for(storage.initialize(), timeout=1)
+        await storage.close()
+
+    asyncio.run(scenario())
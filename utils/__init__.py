@@ -3,5 +3,6 @@
 from .config import get_settings
 from .logging import get_logger
 from .rate_limiter import AsyncRateLimiter, async_retry
+from .serialization import json_dumps, json_dumps_bytes, json_loads, response_json
 
-__all__ = ["get_settings", "get_logger", "AsyncRateLimiter", "async_retry"]
+__all__ = ["get_settings", "get_logger", "AsyncRateLimiter", "async_retry", "json_dumps", "json_dumps_bytes", "json_loads", "response_json"]
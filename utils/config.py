@@ -3,45 +3,72 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Mapping, Optional
 
 
-@dataclass(slots=True)
 class Settings:
-    """Container for runtime configuration values."""
+    """Container for runtime configuration values.
 
-    database_path: Path
-    qq_endpoint: str
-    eastmoney_endpoint: str
-    http_timeout: float
-    calendar_path: Optional[Path]
-    max_requests_per_second: int
-    retry_attempts: int
-    retry_base_delay: float
+    Each value is parsed from the environment the first time it is read and
+    cached on the instance afterwards, so components only pay for the
+    settings they use.  Assigning an attribute overrides that single value,
+    which is convenient in tests.
+    """
 
+    def __init__(self, environ: Optional[Mapping[str, str]] = None) -> None:
+        self._environ: Mapping[str, str] = os.environ if environ is None else environ
 
-@lru_cache(maxsize=1)
-def get_settings() -> Settings:
-    """Return application wide settings sourced from environment variables."""
+    @cached_property
+    def database_path(self) -> Path:
+        return Path(self._environ.get("ASHARE_DATABASE", "ashare.sqlite3")).expanduser()
 
-    database_path = Path(os.getenv("ASHARE_DATABASE", "ashare.sqlite3")).expanduser()
-    calendar = os.getenv("ASHARE_CALENDAR")
-    return Settings(
-        database_path=database_path,
-        qq_endpoint=os.getenv(
+    @cached_property
+    def qq_endpoint(self) -> str:
+        return self._environ.get(
             "ASHARE_QQ_ENDPOINT",
             "https://stockapp.finance.qq.com/mstat/appStockRank/AppStockRank.php",
-        ),
-        eastmoney_endpoint=os.getenv(
+        )
+
+    @cached_property
+    def eastmoney_endpoint(self) -> str:
+        return self._environ.get(
             "ASHARE_EASTMONEY_ENDPOINT",
             "https://push2.eastmoney.com/api/qt/stock/kline/get",
-        ),
-        http_timeout=float(os.getenv("ASHARE_HTTP_TIMEOUT", "10")),
-        calendar_path=Path(calendar).expanduser() if calendar else None,
-        max_requests_per_second=int(os.getenv("ASHARE_MAX_RPS", "5")),
-        retry_attempts=int(os.getenv("ASHARE_RETRY_ATTEMPTS", "3")),
-        retry_base_delay=float(os.getenv("ASHARE_RETRY_BASE_DELAY", "0.5")),
-    )
+        )
+
+    @cached_property
+    def http_timeout(self) -> float:
+        return float(self._environ.get("ASHARE_HTTP_TIMEOUT", "10"))
+
+    @cached_property
+    def calendar_path(self) -> Optional[Path]:
+        calendar = self._environ.get("ASHARE_CALENDAR")
+        return Path(calendar).expanduser() if calendar else None
+
+    @cached_property
+    def max_requests_per_second(self) -> int:
+        return int(self._environ.get("ASHARE_MAX_RPS", "5"))
+
+    @cached_property
+    def max_concurrency(self) -> int:
+        value = int(self._environ.get("ASHARE_MAX_CONCURRENCY", "8"))
+        if value < 1:
+            raise ValueError("ASHARE_MAX_CONCURRENCY must be positive")
+        return value
+
+    @cached_property
+    def retry_attempts(self) -> int:
+        return int(self._environ.get("ASHARE_RETRY_ATTEMPTS", "3"))
+
+    @cached_property
+    def retry_base_delay(self) -> float:
+        return float(self._environ.get("ASHARE_RETRY_BASE_DELAY", "0.5"))
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return application wide settings sourced from environment variables."""
+
+    return Settings()
@@ -7,15 +7,17 @@ consumers to fetch component specific loggers by name.
 from __future__ import annotations
 
 import logging
-from functools import lru_cache
 from typing import Optional
 
 DEFAULT_LOG_LEVEL = logging.INFO
 
 
-@lru_cache(maxsize=None)
 def get_logger(name: Optional[str] = None) -> logging.Logger:
-    """Return a module level logger configured with sensible defaults."""
+    """Return a module level logger configured with sensible defaults.
+
+    :func:`logging.getLogger` already returns the same instance for a name, and
+    a logger that has handlers is returned as is, so no extra cache is needed.
+    """
 
     logger = logging.getLogger(name or "Ashare")
     if logger.handlers:
@@ -3,48 +3,89 @@
 from __future__ import annotations
 
 import asyncio
+import random
+import time
 from functools import wraps
-from typing import Any, Awaitable, Callable, TypeVar
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 
 T = TypeVar("T")
 
 
 class AsyncRateLimiter:
-    """A token bucket style rate limiter for async contexts."""
+    """A token bucket rate limiter for async contexts.
+
+    Allows bursts of up to ``rate`` calls and refills at ``rate / per`` tokens
+    per second.  Waiting callers are served in FIFO order; no background tasks
+    are spawned.
+    """
 
     def __init__(self, *, rate: int, per: float) -> None:
         if rate <= 0:
             raise ValueError("rate must be positive")
         if per <= 0:
             raise ValueError("per must be positive")
-        self._semaphore = asyncio.Semaphore(rate)
-        self._period = per
+        self._capacity = float(rate)
+        self._refill_rate = rate / per
+        self._tokens = self._capacity
+        self._last = time.monotonic()
+        # The lock belongs to the loop that first waits on it, so a fresh one is
+        # created whenever the limiter is used from another event loop (e.g.
+        # successive ``asyncio.run`` calls).
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._refill_rate)
+        self._last = now
 
     async def acquire(self) -> None:
-        await self._semaphore.acquire()
-        asyncio.create_task(self._delayed_release())
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._refill_rate)
+                self._refill()
+            self._tokens -= 1
 
-    async def _delayed_release(self) -> None:
-        await asyncio.sleep(self._period)
-        self._semaphore.release()
 
+def async_retry(
+    *,
+    attempts: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 30.0,
+    jitter: bool = True,
+    exceptions: tuple[type[BaseException], ...] = (Exception,),
+    retry_on: Optional[Callable[[BaseException], bool]] = None,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Retry decorator for ``async`` callables.
 
-def async_retry(*, attempts: int = 3, base_delay: float = 0.5, exceptions: tuple[type[BaseException], ...] = (Exception,)) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
-    """Retry decorator for ``async`` callables."""
+    The delay doubles after every failure up to ``max_delay``.  With
+    ``jitter`` enabled each sleep is drawn uniformly from ``[0, delay]`` so
+    concurrent callers do not retry in lock step.  ``retry_on`` may veto a
+    retry for a given exception, which is then re-raised immediately.
+    """
 
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        if attempts <= 1:
+            return func
+
+        # Sleep caps before each retry, fixed at decoration time.
+        delays = tuple(min(base_delay * 2**retry, max_delay) for retry in range(attempts - 1))
+
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> T:
-            delay = base_delay
-            for attempt in range(1, attempts + 1):
+            for delay in delays:
                 try:
                     return await func(*args, **kwargs)
-                except exceptions:
-                    if attempt == attempts:
+                except exceptions as exc:
+                    if retry_on is not None and not retry_on(exc):
                         raise
-                    await asyncio.sleep(delay)
-                    delay *= 2
-            raise RuntimeError("retry decorator failed unexpectedly")
+                await asyncio.sleep(random.uniform(0, delay) if jitter else delay)
+            return await func(*args, **kwargs)
 
         return wrapper
 
@@ -0,0 +1,54 @@
+"""JSON helpers that use :mod:`orjson` when it is installed.
+
+``orjson`` is an optional speed-up (``pip install Ashare_data[speedups]``); the
+standard library :mod:`json` module is used as a fallback otherwise.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import httpx
+
+try:  # pragma: no cover - depends on the optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - depends on the optional dependency
+    import json
+
+    from json import loads as _loads
+
+    def json_dumps(data: Any) -> str:
+        """Encode ``data`` as compact JSON without escaping non-ASCII characters."""
+
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+    def json_dumps_bytes(data: Any) -> bytes:
+        """Like :func:`json_dumps` but returns UTF-8 encoded bytes."""
+
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+else:  # pragma: no cover - depends on the optional dependency
+    from orjson import loads as _loads
+
+    def json_dumps(data: Any) -> str:
+        """Encode ``data`` as compact JSON without escaping non-ASCII characters."""
+
+        # ``OPT_NON_STR_KEYS`` matches the stdlib's handling of int/float keys.
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def json_dumps_bytes(data: Any) -> bytes:
+        """Like :func:`json_dumps` but returns UTF-8 encoded bytes."""
+
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Decode a JSON document, raising :class:`ValueError` when malformed."""
+
+    return _loads(data)
+
+
+def response_json(response: httpx.Response) -> Any:
+    """Drop-in replacement for :meth:`httpx.Response.json`."""
+
+    return _loads(response.content)